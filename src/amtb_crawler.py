@@ -21,12 +21,15 @@ from urllib.parse import urlparse
 from multiprocessing import Lock
 
 class AmtbCrawler:
+    LOG_DIR = Path("/root/amtb/logs")
+    PROGRESS_FILE = LOG_DIR / "download_progress.json"
+
     def __init__(self):
         self.base_url = "https://ft.amtb.tw/index_as.php"
         self.download_dir = Path("/root/amtb/downloads")
-        self.log_dir = Path("/root/amtb/logs")
+        self.log_dir = self.LOG_DIR
         self.stats_file = self.log_dir / "download_stats.log"
-        self.progress_file = self.log_dir / "download_progress.json"
+        self.progress_file = self.PROGRESS_FILE
         self.failed_file = self.log_dir / "failed_downloads.json"
         
         # 确保目录存在
@@ -183,16 +186,22 @@ class AmtbCrawler:
             f.write(final_stats)
         logging.info(f"讲座 {lecture_no} 处理完成 - {stats}")
 
-    def load_progress(self):
-        """加载下载进度"""
+    @staticmethod
+    def read_progress(progress_file=None):
+        """读取下载进度文件，默认读取 PROGRESS_FILE"""
         import json
-        self.progress = {}
-        if self.progress_file.exists():
+        progress_file = Path(progress_file or AmtbCrawler.PROGRESS_FILE)
+        if progress_file.exists():
             try:
-                with open(self.progress_file, 'r', encoding='utf-8') as f:
-                    self.progress = json.load(f)
+                with open(progress_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
             except Exception as e:
                 logging.error(f"加载进度文件失败: {str(e)}")
+        return {}
+
+    def load_progress(self):
+        """加载下载进度"""
+        self.progress = self.read_progress(self.progress_file)
 
     def save_progress(self, lecture_no, status="completed", current_page=None):
         """保存下载进度（添加进程锁）"""
@@ -262,10 +271,12 @@ class AmtbCrawler:
                 'total_count': 0,
                 'downloaded_count': 0,
                 'success_count': 0,
-                'failed_count': 0
+                'failed_count': 0,
+                'archive_bytes': 0
             }
             
             for lang, lang_name in [('zh_TW', '正体'), ('zh_CN', '简体')]:
+                total_count = 0
                 try:
                     print(f"\n处理{lang_name}版本...")
                     
@@ -305,6 +316,7 @@ class AmtbCrawler:
                     ).text
                     total_count = int(re.search(r'共發現\s*(\d+)\s*筆資料', result_text).group(1))
                     print(f"找到 {total_count} 个文件")
+                    total_stats['total_count'] += total_count
                     
                     if total_count == 0:
                         print(f"{lang_name}版本无可用文件")
@@ -325,6 +337,9 @@ class AmtbCrawler:
                     )
                     checkbox.click()
                     
+                    # 记录下载前已有的zip文件，只统计本次新下载的文件
+                    existing_zips = self.snapshot_zips(lang_dir)
+                    
                     # 开始下载
                     print(f"开始下载{lang_name}版本...")
                     download_button = WebDriverWait(self.driver, 10).until(
@@ -333,10 +348,11 @@ class AmtbCrawler:
                     download_button.click()
                     
                     try:
-                        self.wait_for_download(lang_dir)
+                        new_zips = self.wait_for_download(lang_dir, existing=existing_zips)
                         print(f"{lang_name}版本下载成功")
                         total_stats['downloaded_count'] += total_count
                         total_stats['success_count'] += total_count
+                        total_stats['archive_bytes'] += sum(f.stat().st_size for f in new_zips)
                         self.remove_failed_record(lecture_no, lang)
                     except Exception as e:
                         print(f"{lang_name}版本下载失败: {str(e)}")
@@ -357,6 +373,7 @@ class AmtbCrawler:
             print(f"失败: {total_stats['failed_count']}")
             
             self.save_progress(lecture_no, "completed")
+            return total_stats
             
         except Exception as e:
             print(f"讲座 {lecture_no} 处理出错: {str(e)}")
@@ -375,8 +392,16 @@ class AmtbCrawler:
         }
         self.driver.execute("send_command", params)
 
-    def wait_for_download(self, download_dir, timeout=120):
-        """等待下载完成"""
+    def snapshot_zips(self, download_dir):
+        """记录目录中已有zip文件的修改时间"""
+        return {f: f.stat().st_mtime for f in download_dir.glob("*.zip")}
+
+    def wait_for_download(self, download_dir, timeout=120, existing=None):
+        """等待下载完成，返回本次新增或被更新的zip文件
+
+        existing 为下载前 snapshot_zips 的结果，目录中以前留下的zip不算作本次下载。
+        """
+        existing = existing or {}
         start_time = time.time()
         while time.time() - start_time < timeout:
             # 检查是否有正在下载的文件
@@ -386,9 +411,13 @@ class AmtbCrawler:
                     downloading = True
                     break
             
-            # 如果没有正在下载的文件，且目录中有zip文件，说明下载完成
-            if not downloading and list(download_dir.glob("*.zip")):
-                return True
+            # 如果没有正在下载的文件，且目录中有新的zip文件，说明下载完成
+            new_zips = [
+                f for f in download_dir.glob("*.zip")
+                if existing.get(f) != f.stat().st_mtime
+            ]
+            if not downloading and new_zips:
+                return new_zips
             
             time.sleep(2)
         
@@ -6,7 +6,16 @@ import sys
 import traceback
 import psutil
 import gc
+import queue
 from multiprocessing import Process, Queue
+from scheduler import LectureScheduler
+
+# 并行处理讲座的进程数
+WORKER_COUNT = 2
+# 同一讲座导致进程退出超过该次数后不再重试
+MAX_LECTURE_CRASHES = 1
+# 等待进程报告结果的间隔（秒），超时后检查进程是否退出
+DISPATCH_POLL_SECONDS = 5
 
 def read_lecture_numbers(file_path):
     """读取讲座编号列表"""
@@ -32,36 +41,52 @@ def read_lecture_numbers(file_path):
             
         return lecture_numbers
 
+def read_completed_lectures():
+    """读取爬虫进度文件中已完成的讲座编号"""
+    progress = AmtbCrawler.read_progress()
+    return {no for no, item in progress.items() if item.get("status") == "completed"}
+
 def print_memory_usage():
     """打印内存使用情况"""
     process = psutil.Process()
     memory_mb = process.memory_info().rss / 1024 / 1024
     print(f"内存使用: {memory_mb:.2f} MB")
 
-def process_lectures(lecture_numbers, start_from_end=False, name="进程"):
-    """处理讲座的函数"""
+def process_lectures(task_queue, result_queue, name="进程"):
+    """处理讲座的函数
+
+    每处理完一个讲座就向 result_queue 报告结果并等待下一个任务，
+    收到 None 时退出。
+    """
+    crawler = None
     try:
         crawler = AmtbCrawler()
-        # 如果从尾部开始，则反转列表
-        if start_from_end:
-            lecture_numbers = lecture_numbers[::-1]
+        # 报告空闲，领取第一个任务
+        result_queue.put((name, None, "ready", 0, None))
         
-        total = len(lecture_numbers)
-        for i, lecture_no in enumerate(lecture_numbers, 1):
+        while True:
+            lecture_no = task_queue.get()
+            if lecture_no is None:
+                break
+            
+            status = "completed"
+            stats = None
+            start_time = time.time()
             try:
-                print(f"\n[{name}] 进度: {i}/{total} ({i/total*100:.1f}%)")
-                print(f"[{name}] 处理讲座: {lecture_no}")
+                print(f"\n[{name}] 处理讲座: {lecture_no}")
                 
                 if lecture_no in crawler.progress and crawler.progress[lecture_no]["status"] == "completed":
                     print(f"[{name}] 跳过已完成的讲座: {lecture_no}")
-                    continue
-                
-                crawler.process_lecture(lecture_no)
+                    status = "skipped"
+                else:
+                    stats = crawler.process_lecture(lecture_no)
                 
             except Exception as e:
                 print(f"[{name}] 处理讲座 {lecture_no} 时出错: {str(e)}")
                 traceback.print_exc()
-                continue
+                status = "error"
+            
+            result_queue.put((name, lecture_no, status, time.time() - start_time, stats))
                 
     except Exception as e:
         print(f"[{name}] 进程出错: {str(e)}")
@@ -70,6 +95,91 @@ def process_lectures(lecture_numbers, start_from_end=False, name="进程"):
         if crawler:
             crawler.close()
 
+def dispatch_lectures(scheduler, lecture_numbers, worker_count=WORKER_COUNT):
+    """按预计耗时从长到短把讲座分配给空闲的进程
+
+    每个讲座完成后用实际耗时修正历史记录，并重新排序剩余讲座。
+    """
+    estimates = scheduler.schedule(lecture_numbers)
+    total = len(lecture_numbers)
+    print(f"\n预计总耗时: {sum(estimates.values()) / 3600:.2f} 小时")
+    print("预计耗时最长的前5个讲座:")
+    for no in scheduler.pending[:5]:
+        print(f"  {no}: {estimates[no]:.1f} 秒")
+    
+    result_queue = Queue()
+    workers = {}
+    
+    def start_worker():
+        name = f"进程{len(workers) + 1}"
+        task_queue = Queue()
+        process = Process(target=process_lectures, args=(task_queue, result_queue, name))
+        workers[name] = (process, task_queue)
+        process.start()
+        return name
+    
+    print(f"\n启动 {worker_count} 个进程...")
+    active = {start_worker() for _ in range(worker_count)}
+    
+    try:
+        finished = 0
+        # 每个进程正在处理的讲座，以及导致进程退出的讲座次数
+        in_flight = {}
+        crashes = {}
+        while active:
+            try:
+                name, lecture_no, status, duration, stats = result_queue.get(timeout=DISPATCH_POLL_SECONDS)
+            except queue.Empty:
+                lost_lecture = False
+                for name in list(active):
+                    if workers[name][0].is_alive():
+                        continue
+                    print(f"[{name}] 进程已退出")
+                    active.discard(name)
+                    lost = in_flight.pop(name, None)
+                    if lost is None:
+                        continue
+                    lost_lecture = True
+                    crashes[lost] = crashes.get(lost, 0) + 1
+                    if crashes[lost] > MAX_LECTURE_CRASHES:
+                        print(f"[{name}] 讲座 {lost} 多次导致进程退出，放弃处理")
+                        finished += 1
+                    else:
+                        print(f"[{name}] 讲座 {lost} 未完成，重新加入队列")
+                        scheduler.requeue(lost)
+                # 新进程启动时会清理所有 chrome 实例，只在没有存活进程时才补充；
+                # 进程未领到讲座就退出（如浏览器无法启动）时不再补充
+                if not active and lost_lecture and scheduler.pending:
+                    print("所有进程都已退出，启动新进程继续处理...")
+                    active.add(start_worker())
+                continue
+            
+            in_flight.pop(name, None)
+            if lecture_no is not None:
+                finished += 1
+                print(f"\n[{name}] 讲座 {lecture_no} {status}，耗时 {duration:.1f} 秒")
+                print(f"总进度: {finished}/{total} ({finished/total*100:.1f}%)")
+                if status == "completed":
+                    scheduler.record(lecture_no, duration, stats)
+            
+            next_no = scheduler.next_lecture()
+            workers[name][1].put(next_no)
+            if next_no is None:
+                active.discard(name)
+            else:
+                in_flight[name] = next_no
+        
+        for process, _ in workers.values():
+            process.join()
+        
+    except KeyboardInterrupt:
+        print("\n用户中断程序")
+        print("正在等待进程结束...")
+        for process, _ in workers.values():
+            process.terminate()
+        for process, _ in workers.values():
+            process.join()
+
 def main():
     print("程序启动...")
     print_memory_usage()
@@ -105,26 +215,20 @@ def main():
     print(f"最后一个讲座编号: {lecture_numbers[-1]}")
     print(f"前5个讲座编号: {', '.join(lecture_numbers[:5])}")
     
+    # 已完成的讲座不参与调度，避免占据估计耗时最长的位置
+    completed = read_completed_lectures()
+    pending = [no for no in lecture_numbers if no not in completed]
+    print(f"\n已完成 {len(lecture_numbers) - len(pending)} 个讲座，待处理 {len(pending)} 个讲座")
+    lecture_numbers = pending
+    
+    if not lecture_numbers:
+        print("没有待处理的讲座")
+        return
+    
     try:
-        # 创建两个进程，分别从头和尾开始处理
-        p1 = Process(target=process_lectures, args=(lecture_numbers, False, "正向进程"))
-        p2 = Process(target=process_lectures, args=(lecture_numbers, True, "反向进程"))
-        
-        print("\n启动两个进程...")
-        p1.start()
-        p2.start()
+        scheduler = LectureScheduler(AmtbCrawler.LOG_DIR / 'lecture_history.json')
+        dispatch_lectures(scheduler, lecture_numbers)
         
-        # 等待进程完成
-        p1.join()
-        p2.join()
-        
-    except KeyboardInterrupt:
-        print("\n用户中断程序")
-        print("正在等待进程结束...")
-        p1.terminate()
-        p2.terminate()
-        p1.join()
-        p2.join()
     except Exception as e:
         print(f"\n程序出错: {str(e)}")
         traceback.print_exc()
@@ -0,0 +1,142 @@
+import json
+from datetime import datetime
+from pathlib import Path
+
+
+class LectureScheduler:
+    """根据历史记录估算讲座耗时，按预计最长优先的顺序分配任务"""
+
+    # 没有任何历史记录时的默认估计（秒）
+    DEFAULT_ESTIMATE = 60.0
+
+    def __init__(self, history_file):
+        self.history_file = Path(history_file)
+        self.pending = []
+        self.dirty = False
+        self.load_history()
+
+    def load_history(self):
+        """加载讲座历史记录"""
+        self.history = {}
+        if self.history_file.exists():
+            try:
+                with open(self.history_file, 'r', encoding='utf-8') as f:
+                    self.history = json.load(f)
+            except Exception as e:
+                print(f"加载历史记录失败: {str(e)}")
+
+    def save_history(self):
+        """保存讲座历史记录"""
+        try:
+            self.history_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.history_file, 'w', encoding='utf-8') as f:
+                json.dump(self.history, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"保存历史记录失败: {str(e)}")
+
+    def record(self, lecture_no, duration, stats):
+        """记录讲座的搜索结果数、压缩包大小和耗时
+
+        有下载失败时耗时不可信（超时会拉长耗时），只更新结果数和大小，
+        保留上一次的耗时。
+        """
+        record = self.history.setdefault(lecture_no, {})
+        if stats:
+            if stats.get('total_count'):
+                record['result_count'] = stats['total_count']
+            if stats.get('archive_bytes'):
+                record['archive_bytes'] = stats['archive_bytes']
+            if not stats.get('failed_count'):
+                record['duration'] = round(duration, 2)
+        record['timestamp'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.save_history()
+        # 估计值已修正，下次取任务前重新排序
+        self.dirty = True
+
+    @staticmethod
+    def series_of(lecture_no):
+        """讲座编号的系列前缀，如 01-001- 属于 01 系列"""
+        return lecture_no.split('-')[0]
+
+    def _rates(self):
+        """由有耗时的历史记录计算每笔资料和每字节的平均耗时"""
+        duration_by_count = count = 0
+        duration_by_bytes = size = 0
+        for record in self.history.values():
+            duration = record.get('duration')
+            if not duration:
+                continue
+            if record.get('result_count'):
+                duration_by_count += duration
+                count += record['result_count']
+            if record.get('archive_bytes'):
+                duration_by_bytes += duration
+                size += record['archive_bytes']
+        per_result = duration_by_count / count if count else None
+        per_byte = duration_by_bytes / size if size else None
+        return per_result, per_byte
+
+    def _estimate_record(self, record, per_result, per_byte):
+        """根据单个讲座的历史记录估算耗时，无法估算时返回 None"""
+        if record.get('duration'):
+            return record['duration']
+        if record.get('result_count') and per_result:
+            return record['result_count'] * per_result
+        if record.get('archive_bytes') and per_byte:
+            return record['archive_bytes'] * per_byte
+        return None
+
+    def estimates(self, lecture_numbers):
+        """估算一批讲座的耗时
+
+        依次使用：讲座自身的耗时、按结果数或压缩包大小换算的耗时、
+        同系列讲座的平均值、全部讲座的平均值、默认值。
+        """
+        per_result, per_byte = self._rates()
+
+        known = {}
+        series_totals = {}
+        for lecture_no, record in self.history.items():
+            value = self._estimate_record(record, per_result, per_byte)
+            if value is None:
+                continue
+            known[lecture_no] = value
+            totals = series_totals.setdefault(self.series_of(lecture_no), [0.0, 0])
+            totals[0] += value
+            totals[1] += 1
+
+        overall = (sum(known.values()) / len(known)) if known else self.DEFAULT_ESTIMATE
+
+        result = {}
+        for lecture_no in lecture_numbers:
+            if lecture_no in known:
+                result[lecture_no] = known[lecture_no]
+                continue
+            totals = series_totals.get(self.series_of(lecture_no))
+            result[lecture_no] = totals[0] / totals[1] if totals else overall
+        return result
+
+    def _sort_pending(self):
+        """按预计耗时从长到短排列待处理讲座"""
+        estimates = self.estimates(self.pending)
+        self.pending.sort(key=lambda no: (-estimates[no], no))
+        self.dirty = False
+        return estimates
+
+    def schedule(self, lecture_numbers):
+        """设置待处理讲座并排序，返回估计耗时"""
+        self.pending = list(lecture_numbers)
+        return self._sort_pending()
+
+    def next_lecture(self):
+        """取出预计耗时最长的讲座，没有剩余任务时返回 None"""
+        if not self.pending:
+            return None
+        if self.dirty:
+            self._sort_pending()
+        return self.pending.pop(0)
+
+    def requeue(self, lecture_no):
+        """把未完成的讲座放回队列，下次取任务前重新排序"""
+        self.pending.append(lecture_no)
+        self.dirty = True
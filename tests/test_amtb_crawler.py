@@ -0,0 +1,44 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("selenium")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from selenium.common.exceptions import TimeoutException
+
+from amtb_crawler import AmtbCrawler
+
+
+@pytest.fixture
+def crawler():
+    # 不启动浏览器，只测试与文件相关的方法
+    return AmtbCrawler.__new__(AmtbCrawler)
+
+
+def test_wait_for_download_ignores_existing_zips(tmp_path, crawler):
+    (tmp_path / 'old.zip').write_bytes(b'old')
+    existing = crawler.snapshot_zips(tmp_path)
+
+    with pytest.raises(TimeoutException):
+        crawler.wait_for_download(tmp_path, timeout=1, existing=existing)
+
+
+def test_wait_for_download_returns_new_and_modified_zips(tmp_path, crawler):
+    old_zip = tmp_path / 'old.zip'
+    kept_zip = tmp_path / 'kept.zip'
+    old_zip.write_bytes(b'old')
+    kept_zip.write_bytes(b'kept')
+    existing = crawler.snapshot_zips(tmp_path)
+
+    new_zip = tmp_path / 'new.zip'
+    new_zip.write_bytes(b'new')
+    mtime = existing[old_zip] + 10
+    os.utime(old_zip, (mtime, mtime))
+
+    new_zips = crawler.wait_for_download(tmp_path, timeout=5, existing=existing)
+    assert sorted(new_zips) == sorted([new_zip, old_zip])
+
@@ -0,0 +1,105 @@
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("selenium")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+import main
+from scheduler import LectureScheduler
+
+
+class FakeWorkers:
+    """用线程代替进程，处理到 crash_on 中的讲座时直接退出，模拟进程崩溃"""
+
+    def __init__(self, crash_on=(), start_fails=False, delay=0.02):
+        self.crash_on = set(crash_on)
+        self.start_fails = start_fails
+        self.delay = delay
+        self.started = 0
+        self.processed = []
+        self.attempts = {}
+        self.lock = threading.Lock()
+
+    def worker(self, task_queue, result_queue, name):
+        if self.start_fails:
+            return
+        result_queue.put((name, None, "ready", 0, None))
+        while True:
+            lecture_no = task_queue.get()
+            if lecture_no is None:
+                return
+            with self.lock:
+                self.attempts[lecture_no] = self.attempts.get(lecture_no, 0) + 1
+            time.sleep(self.delay)
+            if lecture_no in self.crash_on:
+                return
+            with self.lock:
+                self.processed.append(lecture_no)
+            result_queue.put((name, lecture_no, "completed", self.delay,
+                              {'total_count': 1, 'failed_count': 0}))
+
+    def process(self, target, args):
+        self.started += 1
+        thread = threading.Thread(target=self.worker, args=args, daemon=True)
+        thread.terminate = lambda: None
+        return thread
+
+
+@pytest.fixture
+def fake_workers(monkeypatch):
+    def install(**kwargs):
+        workers = FakeWorkers(**kwargs)
+        monkeypatch.setattr(main, 'Process', workers.process)
+        monkeypatch.setattr(main, 'Queue', queue.Queue)
+        monkeypatch.setattr(main, 'DISPATCH_POLL_SECONDS', 0.01)
+        return workers
+    return install
+
+
+def make_scheduler(tmp_path):
+    scheduler = LectureScheduler(tmp_path / 'lecture_history.json')
+    # 让 99 系列的讲座排在最前面
+    scheduler.history = {'99-000-': {'duration': 1000}}
+    return scheduler
+
+
+def test_dispatch_processes_all_lectures(tmp_path, fake_workers):
+    workers = fake_workers()
+    scheduler = make_scheduler(tmp_path)
+    lectures = [f"01-{i:03d}-" for i in range(1, 11)]
+
+    main.dispatch_lectures(scheduler, lectures, worker_count=2)
+
+    assert sorted(workers.processed) == lectures
+    assert workers.started == 2
+    assert scheduler.pending == []
+
+
+def test_dispatch_restarts_after_last_worker_dies(tmp_path, fake_workers):
+    workers = fake_workers(crash_on={'99-001-'})
+    scheduler = make_scheduler(tmp_path)
+    others = [f"01-{i:03d}-" for i in range(1, 12)]
+
+    main.dispatch_lectures(scheduler, others + ['99-001-'], worker_count=2)
+
+    # 崩溃的讲座重试一次后放弃，其余讲座全部处理完
+    assert workers.attempts['99-001-'] == main.MAX_LECTURE_CRASHES + 1
+    assert sorted(workers.processed) == others
+    assert scheduler.pending == []
+    assert workers.started > 2
+
+
+def test_dispatch_does_not_restart_when_workers_cannot_start(tmp_path, fake_workers):
+    workers = fake_workers(start_fails=True)
+    scheduler = make_scheduler(tmp_path)
+
+    main.dispatch_lectures(scheduler, ['01-001-', '01-002-'], worker_count=2)
+
+    assert workers.started == 2
+    assert workers.processed == []
@@ -0,0 +1,96 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from scheduler import LectureScheduler
+
+
+def make_scheduler(tmp_path, history=None):
+    history_file = tmp_path / 'lecture_history.json'
+    if history is not None:
+        history_file.write_text(json.dumps(history), encoding='utf-8')
+    return LectureScheduler(history_file)
+
+
+def test_estimates_without_history_use_default(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    estimates = scheduler.estimates(['01-001-', '02-001-'])
+    assert estimates == {
+        '01-001-': LectureScheduler.DEFAULT_ESTIMATE,
+        '02-001-': LectureScheduler.DEFAULT_ESTIMATE,
+    }
+
+
+def test_estimates_fallback_order(tmp_path):
+    scheduler = make_scheduler(tmp_path, {
+        # 每笔资料 2 秒，每字节 0.5 秒
+        '01-001-': {'duration': 200, 'result_count': 100, 'archive_bytes': 400},
+        '01-002-': {'result_count': 30},
+        '02-001-': {'archive_bytes': 100},
+    })
+    estimates = scheduler.estimates(
+        ['01-001-', '01-002-', '02-001-', '01-003-', '02-002-', '03-001-']
+    )
+    # 自身耗时
+    assert estimates['01-001-'] == 200
+    # 按结果数换算
+    assert estimates['01-002-'] == 60
+    # 按压缩包大小换算
+    assert estimates['02-001-'] == 50
+    # 同系列平均值
+    assert estimates['01-003-'] == 130
+    assert estimates['02-002-'] == 50
+    # 全部讲座平均值
+    assert estimates['03-001-'] == (200 + 60 + 50) / 3
+
+
+def test_record_skips_duration_when_downloads_failed(tmp_path):
+    scheduler = make_scheduler(tmp_path, {'01-001-': {'duration': 120}})
+    scheduler.record('01-001-', 500, {
+        'total_count': 40, 'archive_bytes': 1000, 'failed_count': 1,
+    })
+    record = scheduler.history['01-001-']
+    assert record['duration'] == 120
+    assert record['result_count'] == 40
+    assert record['archive_bytes'] == 1000
+
+
+def test_record_saves_history(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    scheduler.record('01-001-', 42.5, {
+        'total_count': 10, 'archive_bytes': 0, 'failed_count': 0,
+    })
+    reloaded = make_scheduler(tmp_path)
+    assert reloaded.history['01-001-']['duration'] == 42.5
+    assert reloaded.history['01-001-']['result_count'] == 10
+    assert 'archive_bytes' not in reloaded.history['01-001-']
+
+
+def test_next_lecture_longest_first(tmp_path):
+    scheduler = make_scheduler(tmp_path, {
+        '01-001-': {'duration': 10},
+        '02-001-': {'duration': 300},
+    })
+    scheduler.schedule(['01-002-', '02-002-', '03-001-'])
+    assert scheduler.next_lecture() == '02-002-'
+    assert scheduler.next_lecture() == '03-001-'
+    assert scheduler.next_lecture() == '01-002-'
+    assert scheduler.next_lecture() is None
+
+
+def test_next_lecture_resorts_after_record(tmp_path):
+    scheduler = make_scheduler(tmp_path, {
+        '01-001-': {'duration': 100},
+        '02-001-': {'duration': 50},
+    })
+    scheduler.schedule(['01-002-', '02-002-', '02-003-'])
+    assert scheduler.next_lecture() == '01-002-'
+
+    # 02 系列实际比预计长得多，剩余的 02 讲座应排到前面
+    scheduler.record('02-001-', 1000, {'total_count': 0, 'failed_count': 0})
+    scheduler.requeue('01-002-')
+    assert scheduler.next_lecture() == '02-002-'
+    assert scheduler.next_lecture() == '02-003-'
+    assert scheduler.next_lecture() == '01-002-'